@@ -1,8 +1,13 @@
 import os
-import time
+import re
+import asyncio
 from dotenv import load_dotenv
-from slack_sdk import WebClient
-from slack_sdk.socket_mode import SocketModeClient
+from slack_sdk.web.async_client import AsyncWebClient
+from slack_sdk.http_retry.builtin_async_handlers import (
+    AsyncRateLimitErrorRetryHandler,
+    AsyncConnectionErrorRetryHandler,
+)
+from slack_sdk.socket_mode.aiohttp import SocketModeClient
 from slack_sdk.socket_mode.request import SocketModeRequest
 from slack_sdk.socket_mode.response import SocketModeResponse
 from slack_sdk.errors import SlackApiError
@@ -19,77 +24,103 @@ SLACK_APP_TOKEN = os.getenv("SLACK_APP_TOKEN")
 # -------------------------
 # Initialize Slack clients
 # -------------------------
-web_client = WebClient(token=SLACK_BOT_TOKEN)
-socket_client = SocketModeClient(app_token=SLACK_APP_TOKEN, web_client=web_client)
+# Async clients multiplex every event on one thread; the socket client is
+# created inside main() so it binds to the running event loop.
+web_client = AsyncWebClient(
+    token=SLACK_BOT_TOKEN,
+    timeout=30,
+    retry_handlers=[
+        AsyncRateLimitErrorRetryHandler(max_retry_count=5),
+        AsyncConnectionErrorRetryHandler(max_retry_count=3),
+    ],
+)
 
 # -------------------------
 # Initialize shop manager
 # -------------------------
 manager = ShopStatusManager()
 
+# -------------------------
+# Command handlers
+# -------------------------
+async def send_message(channel, text):
+    try:
+        await web_client.chat_postMessage(channel=channel, text=text)
+        print(f"[BOT] Sent message: {text}")
+    except SlackApiError as e:
+        print(f"Error posting message: {e.response['error']}")
+
+
+async def handle_whois(channel, user, text):
+    """Respond if user asked who's in the shop."""
+    members = manager.get_current_members()  # fetch real-time members
+    members_list = ", ".join(members) if members else "Nobody"
+    await send_message(channel, f"Current members in the shop: {members_list}")
+
+
+async def handle_approve(channel, user, text):
+    """Approve hours workflow."""
+    parts = text.split()
+    if len(parts) < 2:
+        return
+    member_name = parts[1]
+    approve_all = len(parts) > 2 and parts[2] == "all"
+
+    # --- Check if this user is authorized ---
+    if not manager.is_lead_of(user, member_name):
+        reply = f"⛔ You are not authorized to approve hours for {member_name}."
+    else:
+        success, hours_approved = manager.approve_hours(member_name, approve_all=approve_all)
+        if success:
+            reply = f"{member_name}'s hours approved ✅ Total hours: {hours_approved:.2f}"
+        else:
+            reply = f"No pending hours found for {member_name} ❌"
+
+    await send_message(channel, reply)
+
+
+# "who is in shop" may appear anywhere in the message; other commands are
+# keyed on the message's first word
+WHOIS_RE = re.compile(r"who is in shop")
+COMMANDS = {
+    "approve": handle_approve,
+}
+CMD_RE = re.compile(r"^\s*(\w+)")
+
 # -------------------------
 # Message handler
 # -------------------------
-def process_message(client: SocketModeClient, req: SocketModeRequest):
+async def process_message(client: SocketModeClient, req: SocketModeRequest):
     if req.type == "events_api":
         event = req.payload.get("event", {})
         # Acknowledge event so Slack knows we received it
-        client.send_socket_mode_response(SocketModeResponse(envelope_id=req.envelope_id))
+        await client.send_socket_mode_response(SocketModeResponse(envelope_id=req.envelope_id))
 
         # If it's a message (not from a bot)
         if event.get("type") == "message" and "bot_id" not in event:
             text = event.get("text", "").lower()
-            channel = event.get("channel")
-            user = event.get("user")
-
-            # -------------------------
-            # Respond if user asked who's in the shop
-            # -------------------------
-            if "who is in shop" in text:
-                members = manager.get_current_members()  # fetch real-time members
-                members_list = ", ".join(members) if members else "Nobody"
-                response = f"Current members in the shop: {members_list}"
-                try:
-                    web_client.chat_postMessage(channel=channel, text=response)
-                    print(f"[BOT] Sent message: {response}")
-                except SlackApiError as e:
-                    print(f"Error posting message: {e.response['error']}")
-
-            # -------------------------
-            # Approve hours workflow
-            # -------------------------
-            if text.startswith("approve "):
-                parts = text.split()
-                member_name = parts[1]
-                approve_all = len(parts) > 2 and parts[2].lower() == "all"
-
-                # --- Check if this user is authorized ---
-                if not manager.is_lead_of(user, member_name):
-                    reply = f"⛔ You are not authorized to approve hours for {member_name}."
-                else:
-                    success, hours_approved = manager.approve_hours(member_name, approve_all=approve_all)
-                    if success:
-                        reply = f"{member_name}'s hours approved ✅ Total hours: {hours_approved:.2f}"
-                    else:
-                        reply = f"No pending hours found for {member_name} ❌"
-
-                try:
-                    web_client.chat_postMessage(channel=channel, text=reply)
-                    print(f"[BOT] Sent message: {reply}")
-                except SlackApiError as e:
-                    print(f"Error posting message: {e.response['error']}")
+            if WHOIS_RE.search(text):
+                await handle_whois(event.get("channel"), event.get("user"), text.strip())
+            m = CMD_RE.match(text)
+            handler = COMMANDS.get(m.group(1)) if m else None
+            if handler:
+                await handler(event.get("channel"), event.get("user"), text.strip())
 
 
 # Attach listener and start
 # -------------------------
-socket_client.socket_mode_request_listeners.append(process_message)
+async def main():
+    socket_client = SocketModeClient(app_token=SLACK_APP_TOKEN, web_client=web_client)
+    socket_client.socket_mode_request_listeners.append(process_message)
+
+    print("Starting Slack bot… waiting for messages.")
+    await socket_client.connect()
+
+    # Park the loop forever — no polling while idle
+    await asyncio.Event().wait()
 
-print("Starting Slack bot… waiting for messages.")
-socket_client.connect()
 
-# Keep alive
 try:
-    while True:
-        time.sleep(1)
+    asyncio.run(main())
 except KeyboardInterrupt:
     print("Exiting Slack bot.")
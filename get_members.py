@@ -2,10 +2,13 @@ import os
 import sys
 import csv
 import time
+import random
 import logging
+import functools
 import tempfile
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler, ConnectionErrorRetryHandler
 from dotenv import load_dotenv
 
 # When running as a PyInstaller bundle, data files live in sys._MEIPASS.
@@ -20,46 +23,117 @@ MEMBERS_HEADERS = ["card_uid", "member_name", "slack_id", "seniority", "lead_sla
 
 DEFAULT_SENIORITY = 5  # 1 = most senior, 5 = most junior
 
+# Values for a newly seen member, and for blank fields on an existing one
+MEMBER_DEFAULTS = {
+    "card_uid":      "ABC123",
+    "seniority":     DEFAULT_SENIORITY,
+    "lead_slack_id": "",
+}
+
+WRITE_BUFFER_BYTES = 1 << 16  # batch CSV rows into ~one write() per file
+
+SLACK_HTTP_TIMEOUT   = 30  # seconds per Slack API request
+SLACK_MAX_ATTEMPTS   = 8
+BACKOFF_BASE_SECONDS = 1
+BACKOFF_CAP_SECONDS  = 60
+
 logger = logging.getLogger(__name__)
-client = WebClient(token=SLACK_BOT_TOKEN)
+# The SDK handlers retry transient 429s (honouring Retry-After) and dropped
+# connections inside each call; slack_retry below is the longer outer loop.
+# slack_bot_main reuses this client so the process shares one connection pool.
+client = WebClient(
+    token=SLACK_BOT_TOKEN,
+    timeout=SLACK_HTTP_TIMEOUT,
+    retry_handlers=[
+        RateLimitErrorRetryHandler(max_retry_count=5),
+        ConnectionErrorRetryHandler(max_retry_count=3),
+    ],
+)
+
+# --------------------------
+# Rate-limit retry
+# --------------------------
+def slack_retry(max_attempts=SLACK_MAX_ATTEMPTS):
+    """
+    Retry a Slack call on `ratelimited` errors. Waits Retry-After when Slack
+    sends it, otherwise exponential backoff capped at BACKOFF_CAP_SECONDS.
+    Jitter is added either way so parallel callers don't retry in lockstep.
+    Other errors (and the final failed attempt) are re-raised.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return fn(*args, **kwargs)
+                except SlackApiError as e:
+                    if e.response["error"] != "ratelimited" or attempt == max_attempts - 1:
+                        raise
+                    retry_after = e.response.headers.get("Retry-After")
+                    if retry_after:
+                        delay = int(retry_after)
+                    else:
+                        delay = min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+                    delay += random.uniform(0, BACKOFF_BASE_SECONDS)
+                    logger.warning(f"Rate limited in {fn.__name__}. Retrying in {delay:.1f}s...")
+                    time.sleep(delay)
+        return wrapper
+    return decorator
 
 # --------------------------
 # Fetch channel members
 # --------------------------
+@slack_retry()
+def _conversations_members_page(channel_id, cursor):
+    return client.conversations_members(channel=channel_id, cursor=cursor)
+
 def get_channel_members(channel_id):
+    """
+    Return every member ID in the channel, or None if the list could not be
+    fetched in full (a partial list would drop members from members.csv).
+    """
     members = []
     cursor = None
     while True:
         try:
-            response = client.conversations_members(channel=channel_id, cursor=cursor)
-            members.extend(response["members"])
-            cursor = response["response_metadata"].get("next_cursor")
-            if not cursor:
-                break
+            response = _conversations_members_page(channel_id, cursor)
         except SlackApiError as e:
-            if e.response["error"] == "ratelimited":
-                retry_after = int(e.response.headers.get("Retry-After", 20))
-                logger.warning(f"Rate limited fetching members. Retrying in {retry_after}s...")
-                time.sleep(retry_after)
-            else:
-                logger.error(f"Error fetching channel members: {e.response['error']}")
-                break
+            logger.error(f"Error fetching channel members: {e.response['error']}")
+            return None
+        members.extend(response["members"])
+        cursor = response["response_metadata"].get("next_cursor")
+        if not cursor:
+            break
     return members
 
-def get_user_details(user_id):
-    try:
-        response = client.users_info(user=user_id)
-        if response["ok"]:
-            user = response["user"]
-            if not user.get("is_bot") and not user.get("deleted"):
-                return {
-                    "name": user["profile"].get("real_name", user["name"]),
-                    "id": user["id"]
-                }
-        return None
-    except SlackApiError as e:
-        logger.error(f"Failed to fetch user {user_id}: {e.response['error']}")
-        return None
+@slack_retry()
+def _users_list_page(cursor):
+    return client.users_list(limit=1000, cursor=cursor)
+
+def fetch_all_users():
+    """
+    Return {user_id: display_name} for every active human in the workspace,
+    using paginated users.list so a sync costs one request per 1000 users
+    instead of one per member. Bots and deactivated accounts are dropped and
+    only the name is kept, so the map stays small.
+    Returns None if the list could not be fetched.
+    """
+    users = {}
+    cursor = None
+    while True:
+        try:
+            response = _users_list_page(cursor)
+        except SlackApiError as e:
+            logger.error(f"Error fetching users: {e.response['error']}")
+            return None
+        for user in response["members"]:
+            if user.get("is_bot") or user.get("deleted"):
+                continue
+            users[user["id"]] = user["profile"].get("real_name", user["name"])
+        cursor = response["response_metadata"].get("next_cursor")
+        if not cursor:
+            break
+    return users
 
 # --------------------------
 # Atomic CSV write
@@ -72,7 +146,7 @@ def _atomic_write_csv(filepath, headers, rows):
     dirpath = os.path.dirname(os.path.abspath(filepath))
     fd, tmp_path = tempfile.mkstemp(dir=dirpath, suffix=".tmp")
     try:
-        with os.fdopen(fd, "w", newline="") as f:
+        with os.fdopen(fd, "w", newline="", buffering=WRITE_BUFFER_BYTES) as f:
             writer = csv.DictWriter(f, fieldnames=headers)
             writer.writeheader()
             writer.writerows(rows)
@@ -107,37 +181,37 @@ def update_members_csv():
 
     logger.info(f"Syncing members from channel {MEMBERS_CHANNEL_ID}...")
     member_ids = get_channel_members(MEMBERS_CHANNEL_ID)
+    if member_ids is None:
+        logger.warning("Could not fetch channel members — keeping existing members.csv.")
+        return
     logger.info(f"Found {len(member_ids)} member IDs. Fetching details...")
 
+    all_users = fetch_all_users()
+    if all_users is None:
+        logger.warning("Could not fetch user list — keeping existing members.csv.")
+        return
+
     existing = load_existing_members()
     rows = []
 
-    for uid in member_ids:
-        info = get_user_details(uid)
-        if not info:
-            continue
-
-        slack_id = info["id"]
-        name = info["name"]
-
-        if slack_id in existing:
-            prev = existing[slack_id]
-            rows.append({
-                "card_uid":      prev.get("card_uid", "ABC123"),
-                "member_name":   name,
-                "slack_id":      slack_id,
-                "seniority":     prev.get("seniority", DEFAULT_SENIORITY),
-                "lead_slack_id": prev.get("lead_slack_id", ""),
-            })
-        else:
+    for slack_id in member_ids:
+        name = all_users.get(slack_id)
+        if name is None:
+            continue  # bot, deactivated, or not visible to us
+
+        prev = existing.get(slack_id)
+        if prev is None:
             logger.info(f"New member detected: {name} ({slack_id})")
-            rows.append({
-                "card_uid":      "ABC123",
-                "member_name":   name,
-                "slack_id":      slack_id,
-                "seniority":     DEFAULT_SENIORITY,
-                "lead_slack_id": "",
-            })
+            prev = {}
+
+        # Blank or missing fields fall back to MEMBER_DEFAULTS, same as a new member
+        rows.append({
+            "card_uid":      (prev.get("card_uid") or MEMBER_DEFAULTS["card_uid"]).upper().strip(),
+            "member_name":   name,
+            "slack_id":      slack_id,
+            "seniority":     prev.get("seniority") or MEMBER_DEFAULTS["seniority"],
+            "lead_slack_id": prev.get("lead_slack_id") or MEMBER_DEFAULTS["lead_slack_id"],
+        })
 
     _atomic_write_csv(MEMBERS_FILE, MEMBERS_HEADERS, rows)
     logger.info(f"members.csv updated with {len(rows)} members.")
@@ -1,9 +1,12 @@
 import os
+import csv
 import time
-import pandas as pd
+import queue
+import threading
 from dotenv import load_dotenv
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler, ConnectionErrorRetryHandler
 
 # choose RealPN532 when on the Pi
 from real_pn532 import RealPN532
@@ -23,13 +26,62 @@ SLACK_CHANNEL = os.getenv("SLACK_CHANNEL", "#shop-status")  # default if not set
 # --------------------------
 # Slack helper
 # --------------------------
-client = WebClient(token=SLACK_TOKEN)
+client = WebClient(
+    token=SLACK_TOKEN,
+    timeout=30,
+    retry_handlers=[
+        RateLimitErrorRetryHandler(max_retry_count=5),
+        ConnectionErrorRetryHandler(max_retry_count=3),
+    ],
+)
+
+SLACK_BATCH_WINDOW = 0.5  # seconds to gather messages into a single post
+SLACK_SEND_ATTEMPTS = 5   # network failures retried with 1, 2, 4, 8s backoff
+
+_msg_queue = queue.Queue()
+
+def _post_to_slack(text):
+    # Runs on the sender thread, so backing off here never stalls card reads.
+    for attempt in range(SLACK_SEND_ATTEMPTS):
+        try:
+            client.chat_postMessage(channel=SLACK_CHANNEL, text=text)
+            return
+        except SlackApiError as e:
+            # API-level errors (bad channel, auth) won't fix themselves;
+            # rate limits are already retried by the client
+            print("Slack error:", e.response["error"])
+            return
+        except OSError as e:
+            print(f"Slack unreachable ({e}), attempt {attempt + 1}/{SLACK_SEND_ATTEMPTS}")
+            if attempt < SLACK_SEND_ATTEMPTS - 1:
+                time.sleep(2 ** attempt)
+    print("Dropping Slack message:", text)
+
+def _drain_queue(msgs):
+    while True:
+        try:
+            msgs.append(_msg_queue.get_nowait())
+        except queue.Empty:
+            return msgs
+
+def _slack_sender():
+    # Block until a message arrives, wait briefly for any that follow
+    # (e.g. "Shop open!" + "X checked in"), then send them as one post.
+    while True:
+        msgs = [_msg_queue.get()]
+        time.sleep(SLACK_BATCH_WINDOW)
+        _post_to_slack("\n".join(_drain_queue(msgs)))
 
 def send_slack_message(msg):
-    try:
-        client.chat_postMessage(channel=SLACK_CHANNEL, text=msg)
-    except SlackApiError as e:
-        print("Slack error:", e.response["error"])
+    _msg_queue.put(msg)
+
+def flush_slack_messages():
+    """Send anything still queued; called on exit since the sender is a daemon."""
+    msgs = _drain_queue([])
+    if msgs:
+        _post_to_slack("\n".join(msgs))
+
+threading.Thread(target=_slack_sender, daemon=True, name="SlackSender").start()
 
 # --------------------------
 # Display classes
@@ -69,8 +121,14 @@ display = MockDisplay()      # fallback for testing
 # --------------------------
 # Load members CSV
 # --------------------------
-members = pd.read_csv("members.csv", dtype=str)
-members["card_uid"] = members["card_uid"].str.upper().str.strip()
+with open("members.csv", "r", newline="") as f:
+    members = list(csv.DictReader(f))
+
+# precomputed lookup so a card scan is a single dict probe; the first row
+# wins for a shared uid (e.g. the ABC123 placeholder), like iloc[0] did
+uid_to_name = {}
+for m in members:
+    uid_to_name.setdefault(m["card_uid"].upper().strip(), m["member_name"])
 
 logged_in = set()
 
@@ -80,18 +138,15 @@ logged_in = set()
 print("Waiting for cards. Press Ctrl+C to exit.")
 try:
     while True:
-        uid = pn532.read_passive_target()
+        uid = pn532.read_passive_target()  # already uppercase hex, no separators
         if not uid:
             continue
 
-        uid = uid.upper().strip()
-        row = members[members["card_uid"] == uid]
-        if row.empty:
+        name = uid_to_name.get(uid)
+        if name is None:
             display.show_text("Unknown card")
             continue
 
-        name = row.iloc[0]["name"]
-
         if uid in logged_in:
             logged_in.remove(uid)
             display.show_text(f"Goodbye {name}", duration=2)
@@ -109,4 +164,5 @@ try:
 except KeyboardInterrupt:
     print("Exiting.")
 finally:
+    flush_slack_messages()
     pn532.close()
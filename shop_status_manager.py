@@ -1,33 +1,144 @@
-import pandas as pd
+import os
+import csv
+import time
+import tempfile
 from datetime import datetime
 
+ATTENDANCE_HEADERS = ["card_uid", "member_name", "check_in", "check_out", "hours", "approved"]
+
+WRITE_BUFFER_BYTES = 1 << 16  # batch CSV rows into ~one write() per file
+
+def _is_pending(row):
+    """
+    True if the session still awaits approval. The approved column is text:
+    "False", blank or "None" (case-insensitive) mean pending; anything else,
+    such as "True" or "Disapproved", does not.
+    """
+    return str(row.get("approved") or "").strip().lower() in ("false", "", "none")
+
+# {abspath: ((mtime_ns, size), member rows, {card_uid: row}, {name_lower: row})}
+# shared across instances
+_MEMBERS_CACHE = {}
+
+def _load_members(path):
+    """
+    Parse members.csv once per file version; later calls (from any instance)
+    reuse the result. Nanosecond mtime plus size catches rewrites that land
+    within the same second.
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    version = (st.st_mtime_ns, st.st_size)
+    hit = _MEMBERS_CACHE.get(path)
+    if hit and hit[0] == version:
+        return hit[1:]
+
+    with open(path, "r", newline="") as f:
+        members = [
+            {k: (v or "").strip() for k, v in row.items()}
+            for row in csv.DictReader(f)
+        ]
+    # {card_uid: member row} / {lowercased name: member row} so card and
+    # name lookups are a single dict probe; the first row wins on duplicates
+    # (most unassigned cards share the ABC123 placeholder)
+    by_uid = {}
+    by_name_lower = {}
+    for row in members:
+        by_uid.setdefault(row["card_uid"].upper(), row)
+        by_name_lower.setdefault(row["member_name"].lower(), row)
+    _MEMBERS_CACHE[path] = (version, members, by_uid, by_name_lower)
+    return members, by_uid, by_name_lower
+
 class ShopStatusManager:
     def __init__(self, members_csv="members.csv", attendance_csv="attendance.csv"):
         self.members_csv = members_csv
         self.attendance_csv = attendance_csv
-        self.members = pd.read_csv(self.members_csv, dtype=str)
-        self.current_members = {}  # {member_name: check_in_time}
+        self.members, self._by_uid, self._by_name_lower = _load_members(self.members_csv)
+        self.current_members = {}  # {member_name: (check_in_time, check_in_monotonic)}
+
+        # Attendance rows are kept in memory for approvals; new sessions are
+        # appended through a handle held open for the process lifetime, which
+        # also creates the CSV (with headers) if it doesn't exist.
+        self._attendance = []
+        self._attendance_version = None
+        self._att_fh = None
+        self._refresh_attendance()
 
-        # Create attendance CSV if it doesn't exist
+    def _refresh_attendance(self):
+        """
+        Re-read attendance.csv if it changed on disk since we last read or
+        wrote it (e.g. the Slack bot appended sessions), so an approval
+        rewrite can't drop rows we never saw.
+        """
         try:
-            pd.read_csv(self.attendance_csv)
+            st = os.stat(self.attendance_csv)
+            if (st.st_mtime_ns, st.st_size) == self._attendance_version:
+                return
         except FileNotFoundError:
-            df = pd.DataFrame(columns=["card_uid", "member_name", "check_in", "check_out", "hours", "approved"])
-            df.to_csv(self.attendance_csv, index=False)
+            pass
+        # the file may also have been replaced (the bot rewrites it
+        # atomically), so reopen the append handle on the current one
+        if self._att_fh is not None:
+            self._att_fh.close()
+        self._open_attendance_writer()
+        with open(self.attendance_csv, "r", newline="") as f:
+            self._attendance = list(csv.DictReader(f))
+        self._mark_attendance_written()
+
+    def _mark_attendance_written(self):
+        st = os.stat(self.attendance_csv)
+        self._attendance_version = (st.st_mtime_ns, st.st_size)
+
+    def _open_attendance_writer(self):
+        self._att_fh = open(self.attendance_csv, "a", newline="")
+        self._att_writer = csv.DictWriter(self._att_fh, fieldnames=ATTENDANCE_HEADERS)
+        if self._att_fh.tell() == 0:
+            self._att_writer.writeheader()
+            self._att_fh.flush()
+
+    def _rewrite_attendance(self):
+        """
+        Atomically replace attendance.csv with the in-memory rows. Only used
+        when an existing row changes (approvals); check-outs are appended.
+        """
+        self._att_fh.close()
+        dirpath = os.path.dirname(os.path.abspath(self.attendance_csv))
+        fd, tmp_path = tempfile.mkstemp(dir=dirpath, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", newline="", buffering=WRITE_BUFFER_BYTES) as f:
+                writer = csv.DictWriter(f, fieldnames=ATTENDANCE_HEADERS)
+                writer.writeheader()
+                writer.writerows(self._attendance)
+            os.replace(tmp_path, self.attendance_csv)
+            self._mark_attendance_written()
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        finally:
+            # the old handle pointed at the replaced file
+            self._open_attendance_writer()
+
+    def close(self):
+        self._att_fh.close()
 
     def check_in(self, card_uid):
-        row = self.members[self.members["card_uid"] == card_uid]
-        if row.empty:
+        row = self._by_uid.get(card_uid)
+        if row is None:
             return None  # unknown card
 
-        member_name = row.iloc[0]["member_name"]
+        member_name = row["member_name"]
         if member_name in self.current_members:
             # Already checked in, treat as checkout
             return self.check_out(card_uid)
 
         check_in_time = datetime.now()
-        self.current_members[member_name] = check_in_time
-        lead_slack_id = row.iloc[0]["lead_slack_id"]
+        # wall clock for the log, monotonic clock for the duration so a
+        # clock change (NTP sync on the Pi, DST) can't skew hours
+        self.current_members[member_name] = (check_in_time, time.monotonic())
+        lead_slack_id = row["lead_slack_id"]
         return {
             "action": "check_in",
             "member": member_name,
@@ -36,33 +147,33 @@ class ShopStatusManager:
         }
 
     def check_out(self, card_uid):
-        row = self.members[self.members["card_uid"] == card_uid]
-        if row.empty:
+        row = self._by_uid.get(card_uid)
+        if row is None:
             return None
 
-        member_name = row.iloc[0]["member_name"]
+        member_name = row["member_name"]
         if member_name not in self.current_members:
             return None  # not checked in
 
-        check_in_time = self.current_members.pop(member_name)
+        check_in_time, check_in_mono = self.current_members.pop(member_name)
         check_out_time = datetime.now()
-        duration_hours = round((check_out_time - check_in_time).total_seconds() / 3600, 2)
-        lead_slack_id = row.iloc[0]["lead_slack_id"]
+        duration_hours = round((time.monotonic() - check_in_mono) / 3600, 2)
+        lead_slack_id = row["lead_slack_id"]
 
         # Append to attendance CSV
-        df = pd.read_csv(self.attendance_csv)
-        df = pd.concat([
-            df,
-            pd.DataFrame([{
-                "card_uid": card_uid,
-                "member_name": member_name,
-                "check_in": check_in_time,
-                "check_out": check_out_time,
-                "hours": duration_hours,
-                "approved": False
-            }])
-        ])
-        df.to_csv(self.attendance_csv, index=False)
+        session = {
+            "card_uid": card_uid,
+            "member_name": member_name,
+            "check_in": check_in_time.isoformat(timespec="seconds"),
+            "check_out": check_out_time.isoformat(timespec="seconds"),
+            "hours": str(duration_hours),
+            "approved": "False"
+        }
+        self._refresh_attendance()
+        self._att_writer.writerow(session)
+        self._att_fh.flush()
+        self._attendance.append(session)
+        self._mark_attendance_written()
 
         return {
             "action": "check_out",
@@ -72,36 +183,37 @@ class ShopStatusManager:
         }
 
     def approve_hours(self, member_name):
-        df = pd.read_csv(self.attendance_csv)
         # normalize to lowercase for comparison
-        mask = (df["member_name"].str.lower() == member_name.lower()) & (df["approved"] == False)
-        idx = df[mask].index.max()
-        if pd.isna(idx):
-            return False
-        df.at[idx, "approved"] = True
-        df.to_csv(self.attendance_csv, index=False)
-        return True
+        target = member_name.lower()
+        self._refresh_attendance()
+        for row in reversed(self._attendance):
+            if row["member_name"].lower() == target and _is_pending(row):
+                row["approved"] = "True"
+                self._rewrite_attendance()
+                return True
+        return False
     def approve_all_hours(self, member_name):
         """
         Approve all unapproved hours for the given member.
         Returns total hours approved, or 0 if none found.
         """
-        df = pd.read_csv(self.attendance_csv)
-        mask = (df["member_name"].str.lower() == member_name.lower()) & (df["approved"] == False)
-        to_approve = df[mask]
-
-        if to_approve.empty:
-            return 0.0
+        target = member_name.lower()
+        total_hours = 0.0
+        approved_any = False
+        self._refresh_attendance()
+        for row in self._attendance:
+            if row["member_name"].lower() == target and _is_pending(row):
+                row["approved"] = "True"
+                total_hours += float(row["hours"] or 0)
+                approved_any = True
 
-        total_hours = to_approve["hours"].sum()
-        df.loc[mask, "approved"] = True
-        df.to_csv(self.attendance_csv, index=False)
+        if approved_any:
+            self._rewrite_attendance()
         return total_hours
     def get_current_members(self):
-        return list(self.current_members.keys())
+        return list(self.current_members)
     def is_lead_of(self, lead_slack_id, member_name):
-        member_row = self.members[self.members["member_name"].str.lower() == member_name.lower()]
-        if member_row.empty:
+        member_row = self._by_name_lower.get(member_name.lower())
+        if member_row is None:
             return False
-        lead_id = str(member_row.iloc[0]["lead_ID"]).strip()
-        return lead_id == lead_slack_id
+        return member_row["lead_slack_id"] == lead_slack_id
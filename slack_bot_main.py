@@ -1,22 +1,27 @@
 import os
+import re
 import sys
 import csv
 import time
+import bisect
 import random
 import signal
+import itertools
 import threading
+from operator import itemgetter
 import logging
+import functools
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from logging.handlers import RotatingFileHandler
 from dotenv import load_dotenv
-from slack_sdk import WebClient
 from slack_sdk.socket_mode import SocketModeClient
 from slack_sdk.socket_mode.request import SocketModeRequest
 from slack_sdk.socket_mode.response import SocketModeResponse
 from slack_sdk.errors import SlackApiError
 
-from get_members import update_members_csv
+from get_members import update_members_csv, client as web_client
 
 # --------------------------
 # Configuration
@@ -31,6 +36,10 @@ ADMIN_SLACK_ID      = "U07U7V298Q2"
 MEMBERS_FILE        = "members.csv"
 ATTENDANCE_FILE   = "attendance.csv"
 ATTENDANCE_HEADERS = ["card_uid", "member_name", "check_in", "check_out", "hours", "approved"]
+ATTENDANCE_JOURNAL = "attendance.journal"
+JOURNAL_COMPACT_BYTES = 64 * 1024  # fold the journal into attendance.csv past this size
+JOURNAL_FLUSH_SECONDS = 5  # how long a journaled update may sit in memory before fsync
+WRITE_BUFFER_BYTES  = 1 << 16  # batch CSV rows into ~one write() per file
 
 
 # --------------------------
@@ -107,9 +116,13 @@ SHOP_OPEN_MESSAGES = [
     "Studio entry barrier de-secured - shop accessible",
 ]
 
+# Announcement-ready variants with the trailing period, built once
+_SHOP_OPEN_MESSAGES_DOT = tuple(m + "." for m in SHOP_OPEN_MESSAGES)
+
 # Live in-memory state
 CURRENT_MEMBERS = set()
 USE_FORMAL_MODE  = False
+_CURRENT_SORTED  = ()    # sorted(CURRENT_MEMBERS); None until rebuilt after a change
 
 
 # Watchdog state — keyed by member_name
@@ -124,7 +137,7 @@ SESSION_ALERTS = {}
 # Maps senior_slack_id -> member_name they are being asked to confirm
 SENIOR_PENDING = {}
 
-web_client    = WebClient(token=SLACK_BOT_TOKEN)
+# web_client comes from get_members: one pool, with SDK rate-limit/connection retries
 socket_client = SocketModeClient(app_token=SLACK_APP_TOKEN, web_client=web_client)
 
 # --------------------------
@@ -165,10 +178,13 @@ def _atomic_write_csv(filepath, headers, rows):
     dirpath = os.path.dirname(os.path.abspath(filepath))
     fd, tmp_path = tempfile.mkstemp(dir=dirpath, suffix=".tmp")
     try:
-        with os.fdopen(fd, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(rows)
+        with os.fdopen(fd, "w", newline="", buffering=WRITE_BUFFER_BYTES) as f:
+            # Positional writer: picking the header columns out of each row
+            # skips DictWriter's per-row key checks and drops the private
+            # "_..." fields cached on rows.
+            writer = csv.writer(f)
+            writer.writerow(headers)
+            writer.writerows(map(itemgetter(*headers), rows))
         os.replace(tmp_path, filepath)
     except Exception:
         try:
@@ -185,88 +201,377 @@ def ensure_attendance_file():
         _atomic_write_csv(ATTENDANCE_FILE, ATTENDANCE_HEADERS, [])
         logger.info("Created new attendance.csv")
 
+# Parsed attendance.csv, reused until the file's mtime or size changes on disk
+# (size too, since coarse FAT timestamps can miss a rewrite). Rows
+# are mutated in place and written back, so every read-modify-write holds
+# _ATTENDANCE_LOCK: Socket Mode runs handlers on a worker pool and the
+# watchdog auto-checks-out from its own thread.
+_ATTENDANCE_CACHE = {"key": None, "rows": None}
+_ATTENDANCE_LOCK  = threading.RLock()
+
+def _attendance_locked(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with _ATTENDANCE_LOCK:
+            return fn(*args, **kwargs)
+    return wrapper
+
+# Open sessions (no check_out) in the cached rows, oldest first, so check-in
+# and check-out never scan the whole log. Rebuilt whenever the file is re-parsed.
+_OPEN_BY_UID  = {}  # card_uid -> [row, ...]
+_OPEN_BY_NAME = {}  # lowercased member_name -> [row, ...]
+
+# Sessions still awaiting approval (open ones included), in file order, so
+# `approve pending` / `approve all` only visit that member's pending rows.
+# Kept current by _set_approved().
+_PENDING_STATES  = ("false", "", "none")  # lowercased "approved" values
+_PENDING_BY_NAME = {}  # lowercased member_name -> [row, ...]
+
+# Check-in times in file order, so find_notify_target can bisect to the start
+# of its 24h window. Unparseable check-ins repeat the previous value to keep the
+# list ordered. Rows appended by ShopStatusManager land at check-out time and
+# can break the ordering; _CHECKIN_SORTED then falls back to a full scan.
+_CHECKIN_TIMES  = []
+_CHECKIN_SORTED = True
+
+def _add_checkin_time(check_in_dt):
+    global _CHECKIN_SORTED
+    last = _CHECKIN_TIMES[-1] if _CHECKIN_TIMES else datetime.min
+    if check_in_dt is None:
+        check_in_dt = last
+    elif check_in_dt < last:
+        _CHECKIN_SORTED = False
+    _CHECKIN_TIMES.append(check_in_dt)
+
+def _track_open(row):
+    _OPEN_BY_UID.setdefault(row["card_uid"], []).append(row)
+    _OPEN_BY_NAME.setdefault(row["_name_lc"], []).append(row)
+
+def _untrack_open(row):
+    for index, key in ((_OPEN_BY_UID, row["card_uid"]),
+                       (_OPEN_BY_NAME, row["_name_lc"])):
+        bucket = [r for r in index.get(key, ()) if r is not row]
+        if bucket:
+            index[key] = bucket
+        else:
+            index.pop(key, None)
+
+def _parse_dt(value):
+    """datetime for an ISO timestamp column, or None if blank/unparseable."""
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+def _parse_hours(value):
+    """float for the hours column, or None if blank/unparseable."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+def _set_approved(row, value):
+    was_pending = row["_approved"] in _PENDING_STATES
+    row["approved"]  = value
+    row["_approved"] = value.strip().lower()
+    is_pending = row["_approved"] in _PENDING_STATES
+    if was_pending and not is_pending:
+        bucket = [r for r in _PENDING_BY_NAME.get(row["_name_lc"], ()) if r is not row]
+        if bucket:
+            _PENDING_BY_NAME[row["_name_lc"]] = bucket
+        else:
+            _PENDING_BY_NAME.pop(row["_name_lc"], None)
+    elif is_pending and not was_pending:
+        bisect.insort(_PENDING_BY_NAME.setdefault(row["_name_lc"], []), row, key=itemgetter("_idx"))
+
+def _index_attendance(rows):
+    """
+    Derive each row's private fields once -- "_idx" (position in the file,
+    used by journal records), "_name_lc" (stripped, lowercased member_name),
+    "_check_in_dt"/"_check_out_dt" (parsed datetimes), "_hours" (float) and
+    "_approved" (stripped, lowercased approved) -- and rebuild the open-session
+    index. Unparseable values come through as None. card_uid, member_name and
+    _name_lc are interned, since a few dozen distinct values repeat across
+    every row of the log. Called whenever attendance.csv is re-parsed.
+    """
+    global _CHECKIN_SORTED
+    _OPEN_BY_UID.clear()
+    _OPEN_BY_NAME.clear()
+    _PENDING_BY_NAME.clear()
+    _CHECKIN_TIMES.clear()
+    _CHECKIN_SORTED = True
+    intern = sys.intern
+    for i, row in enumerate(rows):
+        row["_idx"]          = i
+        row["card_uid"]      = intern(row["card_uid"])
+        row["member_name"]   = intern(row["member_name"])
+        row["_name_lc"]      = intern(row["member_name"].strip().lower())
+        row["_check_in_dt"]  = _parse_dt(row["check_in"])
+        row["_check_out_dt"] = _parse_dt(row["check_out"])
+        row["_hours"]        = _parse_hours(row["hours"])
+        row["_approved"]     = row["approved"].strip().lower()
+        _add_checkin_time(row["_check_in_dt"])
+        if not row["check_out"].strip():
+            _track_open(row)
+        if row["_approved"] in _PENDING_STATES:
+            _PENDING_BY_NAME.setdefault(row["_name_lc"], []).append(row)
+
+def _mark_closed(row, checkout_dt, hours):
+    row["check_out"]     = checkout_dt.isoformat()
+    row["hours"]         = hours
+    row["_hours"]        = hours
+    row["_check_out_dt"] = checkout_dt
+    _set_approved(row, "False")
+    _untrack_open(row)
+
+@_attendance_locked
+def find_open_session(card_uid=None, member_name=None):
+    """
+    Most recent open row for card_uid, falling back to member_name
+    (case-insensitive). Returns None if neither has an open session.
+    """
+    read_attendance_rows()  # refresh the index if the file changed
+    bucket = _OPEN_BY_UID.get(card_uid) if card_uid else None
+    if not bucket and member_name:
+        bucket = _OPEN_BY_NAME.get(member_name.strip().lower())
+    return bucket[-1] if bucket else None
+
+def _attendance_key():
+    st = os.stat(ATTENDANCE_FILE)
+    return st.st_mtime_ns, st.st_size
+
+@_attendance_locked
 def read_attendance_rows():
+    """
+    Return the attendance log as a list of row dicts. The list is cached and
+    shared between callers, so anything that mutates a row must persist the
+    change, either by journaling it (see _journal()) or through
+    write_attendance_rows().
+    """
     ensure_attendance_file()
-    with open(ATTENDANCE_FILE, "r", newline="") as f:
-        return list(csv.DictReader(f))
-
+    key = _attendance_key()
+    if _ATTENDANCE_CACHE["key"] != key:
+        with open(ATTENDANCE_FILE, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, ATTENDANCE_HEADERS)
+            width  = len(header)
+            rows   = []
+            for rec in reader:
+                if len(rec) >= width:
+                    rows.append(dict(zip(header, rec)))
+                elif rec:
+                    # most likely a line torn by a power cut mid-append
+                    logger.warning(f"Skipping short attendance row (line {reader.line_num}): {rec}")
+        _replay_journal(rows)
+        _index_attendance(rows)
+        _ATTENDANCE_CACHE["rows"]  = rows
+        _ATTENDANCE_CACHE["key"]   = key
+    return _ATTENDANCE_CACHE["rows"]
+
+@_attendance_locked
 def write_attendance_rows(rows):
-    _atomic_write_csv(ATTENDANCE_FILE, ATTENDANCE_HEADERS, rows)
+    """Atomically rewrite attendance.csv and adopt `rows` as the cached copy."""
+    try:
+        _atomic_write_csv(ATTENDANCE_FILE, ATTENDANCE_HEADERS, rows)
+    except Exception:
+        # rows may already be mutated in memory; force a re-read from disk
+        _ATTENDANCE_CACHE["key"] = None
+        raise
+    _ATTENDANCE_CACHE["rows"]  = rows
+    _ATTENDANCE_CACHE["key"]   = _attendance_key()
 
+# --------------------------
+# Attendance journal
+# --------------------------
+# Check-ins are appended to attendance.csv directly. Changes to existing rows
+# (check-out, approve, disapprove) are appended to attendance.journal as
+# "close,<row>,<card_uid>,<check_in>,<check_out>,<hours>" /
+# "approved,<row>,<card_uid>,<check_in>,<value>" records rather than rewriting
+# the whole CSV, which is kinder to the Pi's SD card. <row> is only a hint: if
+# rows were inserted or deleted by hand since, the record is matched to its
+# session by (card_uid, check_in) instead, and skipped if that is gone. The journal
+# is replayed whenever the CSV is parsed and folded back in by
+# compact_attendance() at startup, at shutdown and once it grows large.
+# Records only set fields, so replaying one that was already compacted is harmless.
+# The journal stays open with a large buffer and is fsynced every
+# JOURNAL_FLUSH_SECONDS by start_journal_flusher() rather than per record, so a
+# power cut can lose the last few seconds of updates; pass durable=True where
+# the caller has to know the change is on disk.
+_JOURNAL = {"fh": None, "size": 0, "dirty": False}
+
+def _replay_journal(rows):
+    if _JOURNAL["fh"] is not None:
+        _JOURNAL["fh"].flush()  # make buffered records visible to the reader
+    try:
+        f = open(ATTENDANCE_JOURNAL, "r", newline="")
+    except FileNotFoundError:
+        return
+    by_key = None
+    with f:
+        for rec in csv.reader(f):
+            try:
+                kind = rec[0]
+                idx, key, values = int(rec[1]), (rec[2], rec[3]), rec[4:]
+                if 0 <= idx < len(rows) and (rows[idx]["card_uid"], rows[idx]["check_in"]) == key:
+                    row = rows[idx]
+                else:
+                    if by_key is None:
+                        by_key = {}
+                        for r in rows:
+                            by_key.setdefault((r["card_uid"], r["check_in"]), r)
+                    row = by_key[key]
+                if kind == "close":
+                    row["check_out"], row["hours"] = values
+                    row["approved"] = "False"
+                elif kind == "approved" and values in (["True"], ["Disapproved"]):
+                    row["approved"] = values[0]
+                else:
+                    raise ValueError(kind)
+            except (IndexError, KeyError, ValueError):
+                # a record torn by a power cut mid-append, or for a session
+                # that has since been removed from attendance.csv by hand
+                logger.warning(f"Skipping bad or unmatched attendance journal record: {rec}")
+
+def _journal_ref(row):
+    """Leading journal fields identifying `row`: position hint plus stable key."""
+    return row["_idx"], row["card_uid"], row["check_in"]
+
+def _journal(*records, durable=False):
+    """Append row updates to the journal; compact once it is large."""
+    try:
+        if _JOURNAL["fh"] is None:
+            _JOURNAL["fh"] = open(ATTENDANCE_JOURNAL, "a", newline="", buffering=WRITE_BUFFER_BYTES)
+            _JOURNAL["size"] = os.path.getsize(ATTENDANCE_JOURNAL)
+        writer = csv.writer(_JOURNAL["fh"])
+        for rec in records:
+            _JOURNAL["size"] += writer.writerow(rec)
+        _JOURNAL["dirty"] = True
+        if durable:
+            flush_journal()
+    except Exception:
+        # the cached rows already hold the change; force a re-read from disk
+        _ATTENDANCE_CACHE["key"] = None
+        raise
+    if _JOURNAL["size"] >= JOURNAL_COMPACT_BYTES:
+        compact_attendance()
+
+@_attendance_locked
+def flush_journal():
+    """Flush and fsync any buffered journal records."""
+    if _JOURNAL["dirty"]:
+        _JOURNAL["fh"].flush()
+        os.fsync(_JOURNAL["fh"].fileno())
+        _JOURNAL["dirty"] = False
+
+def _close_journal():
+    if _JOURNAL["fh"] is not None:
+        flush_journal()
+        _JOURNAL["fh"].close()
+        _JOURNAL["fh"] = None
+
+def start_journal_flusher():
+    """Start a daemon thread that fsyncs the journal every JOURNAL_FLUSH_SECONDS."""
+    def loop():
+        while not _SHUTDOWN.wait(JOURNAL_FLUSH_SECONDS):
+            try:
+                flush_journal()
+            except Exception as e:
+                logger.error(f"Journal flush failed: {e}", exc_info=True)
+
+    t = threading.Thread(target=loop, daemon=True, name="JournalFlusher")
+    t.start()
+    return t
+
+@_attendance_locked
+def compact_attendance():
+    """Fold attendance.journal into attendance.csv and remove it."""
+    if not os.path.exists(ATTENDANCE_JOURNAL):
+        return
+    write_attendance_rows(read_attendance_rows())
+    _close_journal()
+    os.remove(ATTENDANCE_JOURNAL)
+    logger.info("Compacted attendance journal into attendance.csv")
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        if f.seek(0, os.SEEK_END) == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+@_attendance_locked
 def append_session(card_uid, name, check_in_dt):
-    """Append a new check-in row. Uses atomic write to avoid corruption."""
+    """Append a new check-in row without rewriting the rest of the file."""
     rows = read_attendance_rows()
-    rows.append({
+    row = {
         "card_uid":    card_uid,
         "member_name": name,
         "check_in":    check_in_dt.isoformat(),
         "check_out":   "",
         "hours":       "0.0",
         "approved":    "False",
-    })
-    write_attendance_rows(rows)
+    }
+    with open(ATTENDANCE_FILE, "a", newline="") as f:
+        if not _ends_with_newline(ATTENDANCE_FILE):
+            f.write("\r\n")  # terminate a line torn by a power cut so we don't extend it
+        csv.writer(f).writerow([row[h] for h in ATTENDANCE_HEADERS])
+    row["_idx"]          = len(rows)
+    row["_name_lc"]      = name.strip().lower()
+    row["_check_in_dt"]  = check_in_dt
+    row["_check_out_dt"] = None
+    row["_hours"]        = 0.0
+    row["_approved"]     = "false"
+    rows.append(row)
+    _add_checkin_time(check_in_dt)
+    _track_open(row)
+    _PENDING_BY_NAME.setdefault(row["_name_lc"], []).append(row)
+    _ATTENDANCE_CACHE["key"] = _attendance_key()
 
 def get_open_session(card_uid):
-    for row in reversed(read_attendance_rows()):
-        if row["card_uid"] == card_uid and not row["check_out"].strip():
-            return row
-    return None
+    return find_open_session(card_uid=card_uid)
 
-def close_open_session(card_uid, member_name, checkout_dt):
+@_attendance_locked
+def close_open_session(card_uid, member_name, checkout_dt, durable=False):
     """
     Find the most recent open session by card_uid, falling back to member_name.
-    Returns (hours, check_in_iso) or (None, None) if no open session found.
+    Returns (hours, check_in_dt) or (None, None) if no open session found;
+    check_in_dt is None if the row's check_in could not be parsed.
+    durable=True fsyncs the journal before returning.
     """
-    rows = read_attendance_rows()
-    target = None
-
-    for i in range(len(rows) - 1, -1, -1):
-        if rows[i]["card_uid"] == card_uid and not rows[i]["check_out"].strip():
-            target = i
-            break
-
-    if target is None:
-        for i in range(len(rows) - 1, -1, -1):
-            if rows[i]["member_name"].strip().lower() == member_name.strip().lower() \
-                    and not rows[i]["check_out"].strip():
-                target = i
-                break
-
-    if target is None:
+    row = find_open_session(card_uid, member_name)
+    if row is None:
         return None, None
 
-    row = rows[target]
     check_in_iso = row["check_in"]
-
-    try:
-        t1 = datetime.fromisoformat(check_in_iso)
-    except (ValueError, TypeError):
-        t1 = None
+    t1 = row["_check_in_dt"]
 
     hours = round((checkout_dt - t1).total_seconds() / 3600, 2) if t1 else 0.0
-    row["check_out"] = checkout_dt.isoformat()
-    row["hours"]     = hours
-    row["approved"]  = "False"
-    write_attendance_rows(rows)
+    _mark_closed(row, checkout_dt, hours)
+    _journal(("close", *_journal_ref(row), row["check_out"], hours), durable=durable)
     logger.info(f"Session closed for {member_name}: {check_in_iso} -> {checkout_dt.isoformat()} ({hours}h)")
-    return hours, check_in_iso
+    return hours, t1
+
+def _iter_unapproved_sessions(member_name):
+    """Lazily yield (global_index, row) for member_name's pending sessions, oldest first."""
+    with _ATTENDANCE_LOCK:
+        read_attendance_rows()
+        pending = tuple(_PENDING_BY_NAME.get(member_name.strip().lower(), ()))
+    for row in pending:
+        yield row["_idx"], row
 
 def get_unapproved_sessions(member_name):
-    return [
-        (i, row)
-        for i, row in enumerate(read_attendance_rows())
-        if row["member_name"].strip().lower() == member_name.strip().lower()
-        and str(row.get("approved", "")).lower() in ("false", "", "none")
-    ]
+    return list(_iter_unapproved_sessions(member_name))
 
+@_attendance_locked
 def approve_session(global_index):
     rows = read_attendance_rows()
     if not (0 <= global_index < len(rows)):
         return False
-    rows[global_index]["approved"] = "True"
-    write_attendance_rows(rows)
+    _set_approved(rows[global_index], "True")
+    _journal(("approved", *_journal_ref(rows[global_index]), "True"))
     return True
 
+@_attendance_locked
 def delete_session(global_index):
     """
     Mark a session as Disapproved rather than removing it.
@@ -276,22 +581,21 @@ def delete_session(global_index):
     if not (0 <= global_index < len(rows)):
         return False
     name = rows[global_index].get("member_name", "?")
-    rows[global_index]["approved"] = "Disapproved"
-    write_attendance_rows(rows)
+    _set_approved(rows[global_index], "Disapproved")
+    _journal(("approved", *_journal_ref(rows[global_index]), "Disapproved"))
     logger.info(f"Session disapproved for {name} at index {global_index}")
     return True
 
+@_attendance_locked
 def approve_all_sessions(member_name):
-    rows = read_attendance_rows()
-    count = 0
-    for row in rows:
-        if row["member_name"].strip().lower() == member_name.strip().lower():
-            if str(row.get("approved", "")).lower() in ("false", "", "none"):
-                row["approved"] = "True"
-                count += 1
-    if count:
-        write_attendance_rows(rows)
-    return count
+    read_attendance_rows()
+    records = []
+    for row in tuple(_PENDING_BY_NAME.get(member_name.strip().lower(), ())):
+        _set_approved(row, "True")
+        records.append(("approved", *_journal_ref(row), "True"))
+    if records:
+        _journal(*records)
+    return len(records)
 
 # --------------------------
 # Startup recovery
@@ -307,29 +611,22 @@ def rebuild_current_members():
     left. Stale sessions are left open in the CSV so a human can review and
     close them manually, and the admin is notified.
     """
-    rows = read_attendance_rows()
     now = datetime.now()
     stale = []
     recovered = []
 
-    # Track which names we've already processed so we only act on the most
-    # recent open session per person (handles edge case of duplicate open rows)
-    seen_names = set()
-
-    for row in reversed(rows):
-        if row.get("check_out", "").strip():
-            continue  # already closed
-
-        name = row.get("member_name", "").strip()
-        if name in seen_names:
-            continue
-        seen_names.add(name)
+    # The open-session index was filled in by the same pass that parsed the
+    # CSV; its last entry per name is that person's most recent open session
+    # (handles edge case of duplicate open rows). Newest first, as before.
+    with _ATTENDANCE_LOCK:
+        read_attendance_rows()
+        open_rows = sorted((bucket[-1] for bucket in _OPEN_BY_NAME.values()),
+                           key=itemgetter("_idx"), reverse=True)
 
-        try:
-            check_in_dt = datetime.fromisoformat(row["check_in"])
-            age_hours = (now - check_in_dt).total_seconds() / 3600
-        except (ValueError, TypeError):
-            age_hours = 0
+    for row in open_rows:
+        name = row["member_name"].strip()
+        check_in_dt = row["_check_in_dt"]
+        age_hours = (now - check_in_dt).total_seconds() / 3600 if check_in_dt else 0
 
         if age_hours > STALE_SESSION_HOURS:
             stale.append((name, row["check_in"], round(age_hours, 1)))
@@ -338,7 +635,7 @@ def rebuild_current_members():
                 f"{round(age_hours, 1)}h ago) — NOT restoring to CURRENT_MEMBERS."
             )
         else:
-            CURRENT_MEMBERS.add(name)
+            _add_current_member(name)
             recovered.append(name)
             logger.info(f"Restored {name} to CURRENT_MEMBERS (session started {row['check_in']})")
 
@@ -364,16 +661,54 @@ def rebuild_current_members():
 # --------------------------
 # Member CSV helpers
 # --------------------------
+# Parsed members.csv plus a lowercased-name index, reused until the file changes.
+# Keyed on size as well as mtime: on coarse-timestamp filesystems (FAT on an SD
+# card) a sync landing in the same tick as the last one keeps its mtime.
+# The lock keeps a re-parse triggered by the background member sync from
+# racing one triggered by an event handler or the watchdog.
+_MEMBERS_CACHE = {"key": None, "data": {}, "by_name_lc": {}}
+_MEMBERS_LOCK  = threading.Lock()
+
 def load_members():
-    if not os.path.exists(MEMBERS_FILE):
+    """
+    Return {slack_id: member row}. members.csv is only re-parsed when its
+    mtime or size changes; the returned dict is shared, so treat it as read-only.
+    """
+    try:
+        st = os.stat(MEMBERS_FILE)
+    except FileNotFoundError:
         return {}
-    with open(MEMBERS_FILE, "r", newline="") as f:
-        return {
-            row["slack_id"].strip(): {k: v.strip() for k, v in row.items()}
-            for row in csv.DictReader(f)
-        }
-
-def get_seniority(member):
+    key = (st.st_mtime_ns, st.st_size)
+    if _MEMBERS_CACHE["key"] == key:
+        return _MEMBERS_CACHE["data"]
+    with _MEMBERS_LOCK:
+        if _MEMBERS_CACHE["key"] == key:
+            return _MEMBERS_CACHE["data"]
+        with open(MEMBERS_FILE, "r", newline="") as f:
+            data = {
+                row["slack_id"].strip(): {k: v.strip() for k, v in row.items()}
+                for row in csv.DictReader(f)
+            }
+        for m in data.values():
+            m["_seniority"] = _parse_seniority(m)
+        _MEMBERS_CACHE["data"]       = data
+        _MEMBERS_CACHE["by_name_lc"] = _index_by_name(data)
+        _MEMBERS_CACHE["key"]        = key
+    return _MEMBERS_CACHE["data"]
+
+def _index_by_name(members):
+    """{lowercased name: member row} for a {slack_id: row} dict; first row wins."""
+    by_name_lc = {}
+    for m in members.values():
+        by_name_lc.setdefault(m["member_name"].lower(), m)
+    return by_name_lc
+
+def find_member_by_name(name):
+    """Case-insensitive member lookup by display name, or None."""
+    load_members()
+    return _MEMBERS_CACHE["by_name_lc"].get(name.strip().lower())
+
+def _parse_seniority(member):
     """1 = most senior, 5 = most junior. Defaults to 5 on bad data."""
     try:
         val = int(member.get("seniority", 5))
@@ -385,6 +720,42 @@ def get_seniority(member):
                        f"'{member.get('seniority')}' — defaulting to 5")
         return 5
 
+def get_seniority(member):
+    """Seniority parsed once by load_members(); parses on the fly for other dicts."""
+    val = member.get("_seniority")
+    return val if val is not None else _parse_seniority(member)
+
+# Sort key for "most senior first, then alphabetical"
+_SENIORITY_KEY = itemgetter("_seniority", "member_name")
+
+# --------------------------
+# Current-members helpers
+# --------------------------
+# Go through these rather than touching CURRENT_MEMBERS directly so the sorted
+# name list served to "who is in" / "is shop open" is only rebuilt on change.
+_CURRENT_LOCK = threading.Lock()
+
+def _add_current_member(name):
+    global _CURRENT_SORTED
+    with _CURRENT_LOCK:
+        CURRENT_MEMBERS.add(name)
+        _CURRENT_SORTED = None
+
+def _remove_current_member(name):
+    global _CURRENT_SORTED
+    with _CURRENT_LOCK:
+        CURRENT_MEMBERS.discard(name)
+        _CURRENT_SORTED = None
+
+def current_members_sorted():
+    """Return the checked-in member names as a sorted tuple."""
+    global _CURRENT_SORTED
+    with _CURRENT_LOCK:
+        if _CURRENT_SORTED is None:
+            _CURRENT_SORTED = tuple(sorted(CURRENT_MEMBERS))
+        return _CURRENT_SORTED
+
+
 # --------------------------
 # Seniority-based notification helpers
 # --------------------------
@@ -396,10 +767,10 @@ def find_most_senior_in_shop(members, exclude_name=None):
     ]
     if not candidates:
         return None
-    best = min(candidates, key=lambda m: (get_seniority(m), m["member_name"]))
+    best = min(candidates, key=_SENIORITY_KEY)
     return best["slack_id"]
 
-def find_notify_target(check_in_iso, checkout_dt, checking_out_member, members):
+def find_notify_target(session_start, checkout_dt, checking_out_member, members):
     """
     Notification priority for when the shop empties:
       1. Most senior person co-present during the session (from attendance log)
@@ -409,53 +780,50 @@ def find_notify_target(check_in_iso, checkout_dt, checking_out_member, members):
     exclude_name = checking_out_member["member_name"]
     lead_id = checking_out_member.get("lead_slack_id", "").strip()
 
-    try:
-        session_start = datetime.fromisoformat(check_in_iso)
-    except (ValueError, TypeError):
-        logger.warning(f"Could not parse check_in '{check_in_iso}' for {exclude_name} — falling back to lead/admin.")
+    if session_start is None:
+        logger.warning(f"Unparseable check_in for {exclude_name} — falling back to lead/admin.")
         return lead_id or ADMIN_SLACK_ID
 
-    name_to_member = {
-        m["member_name"].strip().lower(): m
-        for m in members.values()
-    }
+    # reuse the cached index when handed load_members()'s own dict
+    if members is _MEMBERS_CACHE["data"]:
+        name_to_member = _MEMBERS_CACHE["by_name_lc"]
+    else:
+        name_to_member = _index_by_name(members)
+    exclude_lc = exclude_name.strip().lower()
 
     # Only look at attendance within a 24h window to avoid false matches
     # from old sessions on different days
     window_start = checkout_dt - timedelta(hours=24)
 
+    # Timestamps were parsed once when the log was loaded
     co_present = []
-    for row in read_attendance_rows():
-        row_name = row.get("member_name", "").strip()
-        if row_name.lower() == exclude_name.strip().lower():
-            continue
-        if row_name.lower() not in name_to_member:
+    with _ATTENDANCE_LOCK:
+        rows  = read_attendance_rows()
+        first = bisect.bisect_left(_CHECKIN_TIMES, window_start) if _CHECKIN_SORTED else 0
+        window_rows = rows[first:]
+    for row in window_rows:
+        row_checkin = row["_check_in_dt"]
+        # Ignore unparseable rows and rows outside our 24h window
+        if row_checkin is None or row_checkin < window_start:
             continue
 
-        try:
-            row_checkin = datetime.fromisoformat(row["check_in"])
-        except (ValueError, TypeError):
-            continue
-
-        # Ignore rows outside our 24h window
-        if row_checkin < window_start:
+        row_name = row["_name_lc"]
+        if row_name == exclude_lc or row_name not in name_to_member:
             continue
 
-        row_checkout_str = row.get("check_out", "").strip()
-        if row_checkout_str:
-            try:
-                row_checkout = datetime.fromisoformat(row_checkout_str)
-            except (ValueError, TypeError):
+        if row.get("check_out", "").strip():
+            row_checkout = row["_check_out_dt"]
+            if row_checkout is None:
                 continue
             overlaps = row_checkin < checkout_dt and row_checkout > session_start
         else:
             overlaps = row_checkin < checkout_dt
 
         if overlaps:
-            co_present.append(name_to_member[row_name.lower()])
+            co_present.append(name_to_member[row_name])
 
     if co_present:
-        best = min(co_present, key=lambda m: (get_seniority(m), m["member_name"]))
+        best = min(co_present, key=_SENIORITY_KEY)
         logger.info(f"Notifying most senior co-present member: {best['member_name']}")
         return best["slack_id"]
 
@@ -479,22 +847,16 @@ def _auto_checkout_member(name, members):
     checkout_time = datetime.now()
 
     # Find the member row so we can look up card_uid
-    member = next(
-        (m for m in members.values() if m["member_name"].strip() == name),
-        None
-    )
+    member = find_member_by_name(name)
     card_uid = member["card_uid"] if member else "ABC123"
 
-    hours, check_in_iso = close_open_session(card_uid, name, checkout_time)
-    CURRENT_MEMBERS.discard(name)
+    hours, check_in_dt = close_open_session(card_uid, name, checkout_time)
+    _remove_current_member(name)
     SESSION_ALERTS.pop(name, None)
 
     logger.info(f"Watchdog auto-checked out {name} after no response ({hours}h)")
 
-    try:
-        hrs = round((checkout_time - datetime.fromisoformat(check_in_iso)).total_seconds() / 3600, 2)               if check_in_iso else round(hours or 0, 2)
-    except (ValueError, TypeError):
-        hrs = round(hours or 0, 2)
+    hrs = hours or 0.0
 
     # Notify the member
     if member:
@@ -503,11 +865,11 @@ def _auto_checkout_member(name, members):
              f"Hours recorded: {hrs}. If this is incorrect, contact an admin.")
 
     # Notify whoever should approve + announce if shop is now empty
-    if member and check_in_iso:
+    if member and hours is not None:
         if CURRENT_MEMBERS:
             notify_id = find_most_senior_in_shop(members, exclude_name=name)
         else:
-            notify_id = find_notify_target(check_in_iso, checkout_time, member, members)
+            notify_id = find_notify_target(check_in_dt, checkout_time, member, members)
 
         if notify_id:
             post(notify_id,
@@ -550,26 +912,18 @@ def _watchdog_tick():
     # Snapshot to avoid mutating CURRENT_MEMBERS while iterating
     for name in list(CURRENT_MEMBERS):
         # Find their open session
-        open_row = None
-        for row in reversed(read_attendance_rows()):
-            if row.get("member_name", "").strip() == name and not row.get("check_out", "").strip():
-                open_row = row
-                break
+        open_row = find_open_session(member_name=name)
 
         if not open_row:
             continue
 
-        try:
-            check_in_dt = datetime.fromisoformat(open_row["check_in"])
-        except (ValueError, TypeError):
+        check_in_dt = open_row["_check_in_dt"]
+        if check_in_dt is None:
             continue
 
         elapsed_h = (now - check_in_dt).total_seconds() / 3600
         alert = SESSION_ALERTS.get(name)
-        member = next(
-            (m for m in members.values() if m["member_name"].strip() == name),
-            None
-        )
+        member = find_member_by_name(name)
         if not member:
             continue
 
@@ -681,24 +1035,56 @@ def confirm_session(name, confirmed_by_slack_id, members):
 # --------------------------
 # Slack posting helpers
 # --------------------------
-def _post_direct(channel, text, retries=3):
-    """Post a message with retry on rate limiting."""
-    for attempt in range(retries):
-        try:
-            web_client.chat_postMessage(channel=channel, text=text)
-            return
-        except SlackApiError as e:
-            err = e.response["error"]
-            if err == "ratelimited" and attempt < retries - 1:
-                wait = int(e.response.headers.get("Retry-After", 5))
-                logger.warning(f"Rate limited posting to {channel}. Retrying in {wait}s...")
-                time.sleep(wait)
-            else:
-                logger.error(f"Failed to post to {channel} after {attempt + 1} attempt(s): {err}")
-                return
+def _post_direct(channel, text):
+    """Post a message. Rate limiting is retried by the client's retry handlers."""
+    try:
+        web_client.chat_postMessage(channel=channel, text=text)
+    except SlackApiError as e:
+        logger.error(f"Failed to post to {channel}: {e.response['error']}")
+
+# Posts run on a small pool so handlers (and the Socket Mode thread behind
+# them) don't wait on Slack's HTTP round-trip, and a reply plus an announcement
+# go out concurrently. _LAST_POST chains posts per channel to keep their order,
+# and consecutive posts to one channel are spaced POST_MIN_INTERVAL_SECONDS
+# apart to stay under Slack's one-message-per-second limit rather than tripping
+# it and waiting out Retry-After (the client's retry handler adds the jitter).
+# Texts posted to a channel while its next post is still waiting its turn are
+# folded into that post, so a burst goes out as one message.
+POST_MIN_INTERVAL_SECONDS = 1.0
+POST_DRAIN_SECONDS        = 5  # how long shutdown waits for queued posts
+_POST_POOL      = ThreadPoolExecutor(max_workers=4, thread_name_prefix="SlackPost")
+_LAST_POST      = {}  # channel -> Future of the latest post queued for it
+_LAST_POST_AT   = {}  # channel -> time.monotonic() of its last post; only its chain writes it
+_QUEUED_TEXTS   = {}  # channel -> texts for its queued post, until that post starts sending
+_LAST_POST_LOCK = threading.Lock()
+_DROP_POSTS     = threading.Event()  # set by drain_posts() once it stops waiting
+
+def _post_after(previous, channel, texts):
+    if previous is not None:
+        wait([previous])
+    delay = _LAST_POST_AT.get(channel, float("-inf")) + POST_MIN_INTERVAL_SECONDS - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+    with _LAST_POST_LOCK:
+        del _QUEUED_TEXTS[channel]  # later posts start a new batch
+    if _DROP_POSTS.is_set():
+        return
+    try:
+        _post_direct(channel, "\n\n".join(texts))
+    except Exception as e:
+        logger.error(f"Failed to post to {channel}: {e}", exc_info=True)
+    finally:
+        _LAST_POST_AT[channel] = time.monotonic()
 
 def post(channel, text):
-    _post_direct(channel, text)
+    with _LAST_POST_LOCK:
+        queued = _QUEUED_TEXTS.get(channel)
+        if queued is not None:
+            queued.append(text)
+            return
+        texts = _QUEUED_TEXTS[channel] = [text]
+        previous = _LAST_POST.get(channel)
+        _LAST_POST[channel] = _POST_POOL.submit(_post_after, previous, channel, texts)
 
 def reply(event, text):
     post(event["channel"], text)
@@ -712,10 +1098,7 @@ def is_authorized_approver(approver_id, target_name, members):
     approver = members.get(approver_id)
     if not approver:
         return False
-    target = next(
-        (m for m in members.values() if m["member_name"].strip().lower() == target_name.strip().lower()),
-        None
-    )
+    target = find_member_by_name(target_name)
     if not target:
         return False
     is_more_senior = get_seniority(approver) < get_seniority(target)
@@ -725,39 +1108,51 @@ def is_authorized_approver(approver_id, target_name, members):
 # --------------------------
 # Command handlers
 # --------------------------
+# Shop-open announcements are dealt from a shuffled deck, so none repeats until
+# every one has been used.
+_SHOP_OPEN_DECK      = []
+_SHOP_OPEN_DECK_LOCK = threading.Lock()
+
+def next_shop_open_message():
+    with _SHOP_OPEN_DECK_LOCK:
+        if not _SHOP_OPEN_DECK:
+            _SHOP_OPEN_DECK.extend(random.sample(_SHOP_OPEN_MESSAGES_DOT, len(_SHOP_OPEN_MESSAGES_DOT)))
+        return _SHOP_OPEN_DECK.pop()
+
 def handle_check_in(event, member):
     name     = member["member_name"]
     card_uid = member["card_uid"]
 
-    existing = get_open_session(card_uid)
-    if existing or name in CURRENT_MEMBERS:
-        if existing:
-            try:
-                since = datetime.fromisoformat(existing["check_in"]).strftime("%Y-%m-%d %H:%M:%S")
-            except (ValueError, TypeError):
-                since = existing.get("check_in", "unknown")
-            reply(event, f"You are already checked in since {since}. Please `check out` first.")
-        else:
-            reply(event, "You are already checked in. Please `check out` first.")
-        return
+    # Check and append under one lock so two `check in`s arriving together
+    # on different Socket Mode workers can't both open a session.
+    with _ATTENDANCE_LOCK:
+        existing = get_open_session(card_uid)
+        if existing or name in CURRENT_MEMBERS:
+            if existing:
+                since = existing["_check_in_dt"]
+                since = since.strftime("%Y-%m-%d %H:%M:%S") if since else existing.get("check_in", "unknown")
+                reply(event, f"You are already checked in since {since}. Please `check out` first.")
+            else:
+                reply(event, "You are already checked in. Please `check out` first.")
+            return
 
-    was_empty = len(CURRENT_MEMBERS) == 0
-    check_in_time = datetime.now()
+        was_empty = len(CURRENT_MEMBERS) == 0
+        check_in_time = datetime.now()
 
-    try:
-        append_session(card_uid, name, check_in_time)
-        CURRENT_MEMBERS.add(name)
-        SESSION_ALERTS.pop(name, None)  # ensure no stale watchdog state
-        logger.info(f"{name} checked in at {check_in_time.isoformat()}")
-    except Exception as e:
-        logger.error(f"Failed to append session for {name}: {e}")
-        reply(event, "Failed to record check-in. Please try again or contact an admin.")
-        return
+        try:
+            append_session(card_uid, name, check_in_time)
+            _add_current_member(name)
+            SESSION_ALERTS.pop(name, None)  # ensure no stale watchdog state
+            logger.info(f"{name} checked in at {check_in_time.isoformat()}")
+        except Exception as e:
+            logger.error(f"Failed to append session for {name}: {e}")
+            reply(event, "Failed to record check-in. Please try again or contact an admin.")
+            return
 
     reply(event, f"Checked in at {check_in_time.strftime('%H:%M:%S')}.")
 
     if was_empty:
-        open_msg = FORMAL_OPEN_MESSAGE if USE_FORMAL_MODE else f"{random.choice(SHOP_OPEN_MESSAGES)}."
+        open_msg = FORMAL_OPEN_MESSAGE if USE_FORMAL_MODE else next_shop_open_message()
         post(ANNOUNCE_CHANNEL_ID, f"{open_msg} {name} checked in.")
 
 
@@ -767,11 +1162,11 @@ def handle_check_out(event, member):
     checkout_time = datetime.now()
     members  = load_members()
 
-    hours, check_in_iso = close_open_session(card_uid, name, checkout_time)
+    hours, check_in_dt = close_open_session(card_uid, name, checkout_time)
 
     if hours is None:
         if name in CURRENT_MEMBERS:
-            CURRENT_MEMBERS.discard(name)
+            _remove_current_member(name)
             logger.warning(f"{name} was in CURRENT_MEMBERS but had no open CSV session — cleared.")
             reply(event, "Inconsistency detected: you were marked as checked in but no CSV session was found. "
                          "Your live state has been cleared - please check in again.")
@@ -779,20 +1174,16 @@ def handle_check_out(event, member):
             reply(event, "You're not currently checked in.")
         return
 
-    try:
-        hrs = round((checkout_time - datetime.fromisoformat(check_in_iso)).total_seconds() / 3600, 2) \
-              if check_in_iso else round(hours, 2)
-    except (ValueError, TypeError):
-        hrs = round(hours, 2)
+    hrs = hours  # already rounded by close_open_session
 
-    CURRENT_MEMBERS.discard(name)
+    _remove_current_member(name)
     SESSION_ALERTS.pop(name, None)  # clear any pending watchdog alert
     reply(event, f"Checked out at {checkout_time.strftime('%H:%M:%S')}.")
 
     if CURRENT_MEMBERS:
         notify_id = find_most_senior_in_shop(members, exclude_name=name)
     else:
-        notify_id = find_notify_target(check_in_iso, checkout_time, member, members)
+        notify_id = find_notify_target(check_in_dt, checkout_time, member, members)
 
     if notify_id:
         post(notify_id,
@@ -827,31 +1218,14 @@ def handle_admin_force_checkout(event, slack_id, parts, members):
     target_name = " ".join(parts[3:])
     checkout_time = datetime.now()
 
-    # Try to find an open session by name
-    rows = read_attendance_rows()
-    target_idx = None
-    for i in range(len(rows) - 1, -1, -1):
-        if rows[i]["member_name"].strip().lower() == target_name.strip().lower() \
-                and not rows[i]["check_out"].strip():
-            target_idx = i
-            break
-
-    if target_idx is None:
+    # Close the most recent open session by name (no card to match on)
+    hrs, _ = close_open_session(None, target_name, checkout_time, durable=True)
+
+    if hrs is None:
         reply(event, f"No open session found for '{target_name}'.")
         return
 
-    row = rows[target_idx]
-    try:
-        t1 = datetime.fromisoformat(row["check_in"])
-        hrs = round((checkout_time - t1).total_seconds() / 3600, 2)
-    except (ValueError, TypeError):
-        hrs = 0.0
-
-    row["check_out"] = checkout_time.isoformat()
-    row["hours"]     = hrs
-    row["approved"]  = "False"
-    write_attendance_rows(rows)
-    CURRENT_MEMBERS.discard(target_name)
+    _remove_current_member(target_name)
     SESSION_ALERTS.pop(target_name, None)
     if target_name in SENIOR_PENDING.values():
         SENIOR_PENDING = {k: v for k, v in SENIOR_PENDING.items() if v != target_name}
@@ -901,7 +1275,8 @@ def handle_approve_disapprove(event, slack_id, text, members):
         if not is_authorized_approver(slack_id, target_name, members):
             reply(event, "You're not authorized to approve/disapprove sessions for that member.")
             return
-        pending = get_unapproved_sessions(target_name)
+        # Stop scanning once the requested session is found
+        pending = list(itertools.islice(_iter_unapproved_sessions(target_name), session_num))
         if session_num > len(pending):
             reply(event, f"Invalid session number - {target_name} has {len(pending)} pending session(s).")
             return
@@ -944,15 +1319,15 @@ def handle_announcement_casual(event, slack_id):
 
 
 def handle_is_shop_open(channel):
-    if CURRENT_MEMBERS:
-        people = sorted(CURRENT_MEMBERS)
+    people = current_members_sorted()
+    if people:
         post(channel, "Yes, the shop is open. Currently checked in:\n- " + "\n- ".join(people))
     else:
         post(channel, "No, the shop is currently closed.")
 
 
 def handle_who_is_in(event):
-    people = sorted(CURRENT_MEMBERS)
+    people = current_members_sorted()
     if people:
         reply(event, "Currently checked in:\n- " + "\n- ".join(people))
     else:
@@ -993,22 +1368,18 @@ def get_sessions_this_year(member_name, include_disapproved=False):
     """
     start, end = get_academic_year_bounds()
     rows = read_attendance_rows()
+    target_lc = member_name.strip().lower()
     results = []
 
     for row in rows:
-        if row["member_name"].strip().lower() != member_name.strip().lower():
+        if row["_name_lc"] != target_lc:
             continue
 
-        try:
-            check_in_dt = datetime.fromisoformat(row["check_in"])
-        except (ValueError, TypeError):
+        check_in_dt = row["_check_in_dt"]
+        if check_in_dt is None or not (start <= check_in_dt <= end):
             continue
 
-        if not (start <= check_in_dt <= end):
-            continue
-
-        approved_val = str(row.get("approved", "")).strip().lower()
-        is_disapproved = approved_val == "disapproved"
+        is_disapproved = row["_approved"] == "disapproved"
 
         if not include_disapproved and is_disapproved:
             continue
@@ -1069,40 +1440,31 @@ def format_hours_report(sessions, include_disapproved=False):
     total_pending  = 0.0
 
     for i, row in enumerate(sessions, start=1):
-        approved = str(row.get("approved", "")).strip().lower()
+        approved = row["_approved"]
+        hours    = row["_hours"]
 
         if approved == "false" or approved == "":
             status = "⏳ Pending"
-            try:
-                total_pending += float(row.get("hours", 0))
-            except (ValueError, TypeError):
-                pass
+            if hours is not None:
+                total_pending += hours
         elif approved == "true":
             status = "✅ Approved"
-            try:
-                total_approved += float(row.get("hours", 0))
-            except (ValueError, TypeError):
-                pass
+            if hours is not None:
+                total_approved += hours
         else:
             # "disapproved" / deleted row still in file edge case
             if not include_disapproved:
                 continue
             status = "❌ Disapproved"
 
-        try:
-            ci = datetime.fromisoformat(row["check_in"]).strftime("%b %d  %H:%M")
-        except (ValueError, TypeError):
-            ci = row.get("check_in", "?")
+        ci = row["_check_in_dt"].strftime("%b %d  %H:%M") if row["_check_in_dt"] else row["check_in"]
 
-        try:
-            co = datetime.fromisoformat(row["check_out"]).strftime("%H:%M") if row.get("check_out", "").strip() else "(open)"
-        except (ValueError, TypeError):
-            co = row.get("check_out", "?")
+        if not row["check_out"].strip():
+            co = "(open)"
+        else:
+            co = row["_check_out_dt"].strftime("%H:%M") if row["_check_out_dt"] else row["check_out"]
 
-        try:
-            hrs = f"{float(row.get('hours', 0)):.2f}h"
-        except (ValueError, TypeError):
-            hrs = "?h"
+        hrs = f"{hours:.2f}h" if hours is not None else "?h"
 
         lines.append(f"{i}. {ci} – {co}  |  {hrs}  |  {status}")
 
@@ -1115,21 +1477,17 @@ def get_semester_sessions(member_name, start_date, end_date, include_disapproved
     [start_date, end_date]. Filters out disapproved rows unless include_disapproved.
     """
     rows = read_attendance_rows()
+    target_lc = member_name.strip().lower()
     results = []
     for row in rows:
-        if row.get("member_name", "").strip().lower() != member_name.strip().lower():
+        if row["_name_lc"] != target_lc:
             continue
 
-        approved = str(row.get("approved", "")).strip().lower()
-        if not include_disapproved and approved not in ("true", "false", ""):
+        if not include_disapproved and row["_approved"] not in ("true", "false", ""):
             continue  # skip disapproved
 
-        try:
-            ci_date = datetime.fromisoformat(row["check_in"]).date()
-        except (ValueError, TypeError):
-            continue
-
-        if start_date <= ci_date <= end_date:
+        check_in_dt = row["_check_in_dt"]
+        if check_in_dt is not None and start_date <= check_in_dt.date() <= end_date:
             results.append(row)
 
     return results
@@ -1181,10 +1539,7 @@ def handle_hours_report(event, slack_id, text_lc, members):
         reply(event, "You're not authorized to view hours for that member.")
         return
 
-    target = next(
-        (m for m in members.values() if m["member_name"].strip().lower() == target_name.lower()),
-        None
-    )
+    target = find_member_by_name(target_name)
     if not target:
         reply(event, f"Member '{target_name}' not found.")
         return
@@ -1214,6 +1569,11 @@ def handle_hours_report(event, slack_id, text_lc, members):
 # --------------------------
 # Main event dispatcher
 # --------------------------
+# Natural-language queries, matched against the lowercased message text
+_PUBLIC_WHO_RE = re.compile(r"who(?:'s| is) in(?: the)? shop")
+_SHOP_OPEN_RE  = re.compile(r"is (?:the )?shop open")
+_DM_WHO_RE     = re.compile(r"who(?:'s| is) in")
+
 def process_message(client, req):
     if req.type != "events_api":
         return
@@ -1230,11 +1590,11 @@ def process_message(client, req):
 
     # Public channels
     if channel_type in ("channel", "group"):
-        if any(p in text_lc for p in ["who is in shop", "who's in shop", "who is in the shop", "who's in the shop"]):
-            people = sorted(CURRENT_MEMBERS)
+        if _PUBLIC_WHO_RE.search(text_lc):
+            people = current_members_sorted()
             msg = "Currently in shop: " + ", ".join(people) if people else "The shop is currently empty."
             post(event["channel"], msg)
-        elif "is shop open" in text_lc or "is the shop open" in text_lc:
+        elif _SHOP_OPEN_RE.search(text_lc):
             handle_is_shop_open(event["channel"])
         return
 
@@ -1269,10 +1629,7 @@ def process_message(client, req):
             if ok:
                 reply(event, f"Confirmed — {target_name}'s session has been extended.")
                 # Also notify the member their session was confirmed by someone else
-                target_member = next(
-                    (m for m in members.values() if m["member_name"].strip() == target_name),
-                    None
-                )
+                target_member = find_member_by_name(target_name)
                 if target_member:
                     post(target_member["slack_id"],
                          f"Your session was confirmed by a senior member. "
@@ -1296,13 +1653,13 @@ def process_message(client, req):
         handle_announcement_formal(event, slack_id)
     elif text_lc == "announcement casual":
         handle_announcement_casual(event, slack_id)
-    elif "is shop open" in text_lc or "is the shop open" in text_lc:
+    elif _SHOP_OPEN_RE.search(text_lc):
         handle_is_shop_open(event["channel"])
     elif text_lc == "my hours":
         handle_my_hours(event, member)
     elif text_lc.startswith("hours report "):
         handle_hours_report(event, slack_id, text_lc, members)
-    elif "who is in" in text_lc or "who's in" in text_lc:
+    elif _DM_WHO_RE.search(text_lc):
         handle_who_is_in(event)
     else:
         reply(event, (
@@ -1323,12 +1680,45 @@ def process_message(client, req):
 # --------------------------
 # Graceful shutdown
 # --------------------------
+_SHUTDOWN = threading.Event()
+
 def handle_shutdown(signum, frame):
     logger.info(f"Received signal {signum}. Shutting down gracefully...")
     # Log who is still checked in so it's easy to reconstruct state
     if CURRENT_MEMBERS:
-        logger.info(f"Members still checked in at shutdown: {', '.join(sorted(CURRENT_MEMBERS))}")
-    sys.exit(0)
+        logger.info(f"Members still checked in at shutdown: {', '.join(current_members_sorted())}")
+    try:
+        flush_journal()
+    except Exception as e:
+        logger.error(f"Journal flush at shutdown failed: {e}")
+    _SHUTDOWN.set()
+
+def drain_posts():
+    """
+    Give queued Slack posts up to POST_DRAIN_SECONDS to go out, then drop the
+    rest. The pool's worker threads are still joined at interpreter exit, so a
+    post already inside chat_postMessage (e.g. waiting out a rate limit) can
+    delay the exit until that one call returns or times out.
+    """
+    with _LAST_POST_LOCK:
+        pending = list(_LAST_POST.values())
+    _, not_done = wait(pending, timeout=POST_DRAIN_SECONDS)
+    if not_done:
+        logger.warning(f"Dropping queued posts for {len(not_done)} channel(s) at shutdown")
+        _DROP_POSTS.set()  # chained posts still waiting their turn skip sending
+    _POST_POOL.shutdown(wait=False, cancel_futures=True)
+
+def wait_for_shutdown():
+    """
+    Park the main thread until a signal handler sets _SHUTDOWN. On POSIX the
+    wait is interrupted by signals, so it never wakes while idle. Windows only
+    runs signal handlers between waits, so wake once a second there.
+    """
+    if sys.platform == "win32":
+        while not _SHUTDOWN.wait(1):
+            pass
+    else:
+        _SHUTDOWN.wait()
 
 
 # --------------------------
@@ -1338,13 +1728,23 @@ setup_logging()
 logger.info("=" * 60)
 logger.info("Bot starting up")
 
-logger.info("Syncing members list...")
-try:
-    update_members_csv()
-except Exception as e:
-    logger.error(f"Member sync failed: {e} — continuing with existing members.csv")
+def _sync_members():
+    """
+    Refresh members.csv from Slack. Runs in the background so the socket
+    connects straight away; until it finishes, load_members() serves the
+    existing file and picks up the rewrite through its mtime check.
+    """
+    logger.info("Syncing members list...")
+    try:
+        update_members_csv()
+        logger.info("Members list synced.")
+    except Exception as e:
+        logger.error(f"Member sync failed: {e} — continuing with existing members.csv")
+
+threading.Thread(target=_sync_members, daemon=True, name="MembersSync").start()
 
 ensure_attendance_file()
+compact_attendance()  # fold in updates journaled before the last stop
 
 logger.info("Rebuilding in-memory state from attendance log...")
 recovered, stale = rebuild_current_members()
@@ -1355,6 +1755,7 @@ else:
 
 logger.info("Starting session watchdog...")
 start_watchdog()
+start_journal_flusher()
 
 # Register signal handlers for graceful shutdown
 signal.signal(signal.SIGTERM, handle_shutdown)
@@ -1364,8 +1765,7 @@ socket_client.socket_mode_request_listeners.append(process_message)
 socket_client.connect()
 logger.info("Slack attendance bot running and connected.")
 
-try:
-    while True:
-        time.sleep(1)
-except (KeyboardInterrupt, SystemExit):
-    logger.info("Shutting down...")
+wait_for_shutdown()
+logger.info("Shutting down...")
+drain_posts()
+compact_attendance()  # so the next start has no journal to replay